@@ -0,0 +1,33 @@
+"""示例脚本共用的辅助函数。"""
+
+import asyncio
+import functools
+import json
+
+# 美化输出 JSON（保留非 ASCII 字符）
+pretty_json = functools.partial(json.dumps, indent=2, ensure_ascii=False)
+_preview_encoder = json.JSONEncoder(indent=2, ensure_ascii=False)
+
+
+def preview_json(obj, limit: int) -> str:
+    """美化输出 JSON 的前 limit 个字符，增量编码到足够长度即停止，不序列化整个对象。"""
+    parts = []
+    size = 0
+    for chunk in _preview_encoder.iterencode(obj):
+        parts.append(chunk)
+        size += len(chunk)
+        if size >= limit:
+            break
+    return "".join(parts)[:limit]
+
+
+def install_uvloop() -> None:
+    """uvloop 可用时将其设为事件循环策略，否则保持默认事件循环。
+
+    uvloop 由 uvicorn[standard] 引入（非 Windows 平台）。
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
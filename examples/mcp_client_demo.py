@@ -7,43 +7,135 @@ MCP 客户端 Demo
 """
 
 import asyncio
+import atexit
 import json
 import logging
+import logging.handlers
 import os
+import queue
 import sys
 from pathlib import Path
 
-import structlog
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
+from mcp.types import TextContent
 
-logger = structlog.get_logger(__name__)
+from _common import install_uvloop, pretty_json
+
+logger = logging.getLogger(__name__)
 
 # Configuration: ANP service domain
 ANP_DOMAIN = "https://agent-connect.ai"
 
+# 演示用的固定工具参数（模块加载时构建一次）
+TEST_URL = f"{ANP_DOMAIN}/agents/test/ad.json"
+TEST_MESSAGE = "Hello from MCP client!"
+JSONRPC_ENDPOINT = f"{ANP_DOMAIN}/agents/test/jsonrpc"
+FETCH_ARGS = {"url": TEST_URL}
+ECHO_ARGS = {
+    "endpoint": JSONRPC_ENDPOINT,
+    "method": "echo",
+    "params": {"message": TEST_MESSAGE},
+}
+STATUS_ARGS = {"endpoint": JSONRPC_ENDPOINT, "method": "getStatus", "params": {}}
+
 # Configure DID credentials using absolute paths
-project_root = Path(__file__).parent.parent
-os.environ["ANP_DID_DOCUMENT_PATH"] = str(
-    project_root / "docs" / "did_public" / "public-did-doc.json"
-)
-os.environ["ANP_DID_PRIVATE_KEY_PATH"] = str(
-    project_root / "docs" / "did_public" / "public-private-key.pem"
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DID_PUBLIC_DIR = PROJECT_ROOT / "docs" / "did_public"
+os.environ["ANP_DID_DOCUMENT_PATH"] = str(DID_PUBLIC_DIR / "public-did-doc.json")
+os.environ["ANP_DID_PRIVATE_KEY_PATH"] = str(DID_PUBLIC_DIR / "public-private-key.pem")
+
+# MCP 服务器参数（模块级常量，演示过程中只创建一次）
+SERVER_PARAMS = StdioServerParameters(
+    command="uv", args=["run", "python", "-m", "mcp2anp.server"], env=None
 )
 
+_log_configured = False
+
+
+def configure_logging() -> None:
+    """配置日志（只执行一次），重复运行 main() 时不再重复设置。
+
+    日志记录经 QueueHandler 入队，由后台 QueueListener 线程写入 stderr，
+    协程中记录日志不会阻塞在终端 I/O 上。
+    """
+    global _log_configured
+    if _log_configured:
+        return
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    # 进程退出前停止监听线程，确保队列中的日志全部写出
+    atexit.register(listener.stop)
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.INFO)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _log_configured = True
+
+
+# 演示结束时输出的说明文字（一次性写出）
+DEMO_SUMMARY = """
+=== 演示完成 ===
+演示内容包括:
+- anp.fetchDoc: 获取智能体描述文档
+- anp.invokeOpenRPC(echo): 调用回显方法测试连接
+- anp.invokeOpenRPC(getStatus): 获取智能体状态信息
+
+环境变量配置:
+- ANP_DID_DOCUMENT_PATH: 自定义 DID 文档路径
+- ANP_DID_PRIVATE_KEY_PATH: 自定义 DID 私钥路径
+（未设置时使用默认凭证）
+
+要在实际项目中使用，你可以:
+1. 导入 MCP SDK: from mcp import ClientSession, StdioServerParameters
+2. 导入 stdio_client: from mcp.client.stdio import stdio_client
+3. 配置服务器参数: server_params = StdioServerParameters(...)
+4. 使用 async with stdio_client(server_params) 创建连接
+5. 使用 async with ClientSession(read, write) 创建会话
+6. 调用 session.initialize() 初始化
+7. 使用 session.list_tools() 获取工具列表
+8. 使用 session.call_tool(name, arguments) 调用工具"""
+
+
+def _format_tool_result(result) -> str:
+    """把工具调用结果的全部文本内容拼成一个字符串，便于一次性输出。"""
+    parts: list[str] = []
+    for content in result.content:
+        # 直接按类型判断，避免为每个内容块执行一次 model_dump()
+        if not isinstance(content, TextContent):
+            continue
+        text = content.text
+        # 尝试解析并美化 JSON 响应
+        try:
+            text_data = json.loads(text)
+            parts.append(pretty_json(text_data))
+        except json.JSONDecodeError:
+            parts.append(text)
+    return "\n".join(parts)
+
+
+def _print_tool_step(label: str, result) -> None:
+    """打印一次工具调用的结果；调用失败时打印错误与排查提示。"""
+    if isinstance(result, Exception):
+        print(
+            f"调用 {label} 失败: {result}\n"
+            f"提示: 请确保本地 ANP 服务器正在运行 (ANP_DOMAIN: {ANP_DOMAIN})"
+        )
+    else:
+        print(f"\n{label} 调用结果:\n{_format_tool_result(result)}")
+
 
 async def demo_basic_usage():
     """演示基本用法"""
     print("=== MCP 客户端基本用法演示 ===")
     print("注意: DID 认证通过环境变量配置，或使用默认凭证\n")
 
-    # 配置 MCP 服务器参数
-    server_params = StdioServerParameters(
-        command="uv", args=["run", "python", "-m", "mcp2anp.server"], env=None
-    )
-
-    # 使用 MCP SDK 的 stdio_client 连接服务器
-    async with stdio_client(server_params) as (read, write):
+    # 使用 MCP SDK 的 stdio_client 连接服务器，全部演示步骤共用同一个会话
+    async with stdio_client(SERVER_PARAMS) as (read, write):
         async with ClientSession(read, write) as session:
             # 初始化会话
             await session.initialize()
@@ -51,102 +143,41 @@ async def demo_basic_usage():
             # 获取工具列表
             tools_result = await session.list_tools()
             tools = tools_result.tools
-            print(f"可用工具数量: {len(tools)}")
-            for tool in tools:
-                print(f"  - {tool.name}: {tool.description or '无描述'}")
+            lines = [f"可用工具数量: {len(tools)}"]
+            lines.extend(
+                f"  - {tool.name}: {tool.description or '无描述'}" for tool in tools
+            )
+            print("\n".join(lines))
+
+            # 三个工具调用互不依赖，并发发出，总耗时约等于最慢的一次往返
+            fetch_result, rpc_result, status_result = await asyncio.gather(
+                session.call_tool("anp.fetchDoc", arguments=FETCH_ARGS),
+                session.call_tool("anp.invokeOpenRPC", arguments=ECHO_ARGS),
+                session.call_tool("anp.invokeOpenRPC", arguments=STATUS_ARGS),
+                return_exceptions=True,
+            )
 
             # 演示调用 anp.fetchDoc 工具（测试本地 ANP 服务器）
             print("\n=== 演示调用 anp.fetchDoc 工具 ===")
-            test_url = f"{ANP_DOMAIN}/agents/test/ad.json"
-            print(f"测试 URL: {test_url}")
-            try:
-                result = await session.call_tool(
-                    "anp.fetchDoc", arguments={"url": test_url}
-                )
-                print("\nfetchDoc 结果:")
-                for content in result.content:
-                    content_dict = content.model_dump()
-                    if content_dict.get("type") == "text":
-                        # 尝试解析并美化 JSON 响应
-                        try:
-                            text_data = json.loads(content_dict.get("text", "{}"))
-                            print(json.dumps(text_data, indent=2, ensure_ascii=False))
-                        except json.JSONDecodeError:
-                            print(content_dict.get("text"))
-            except Exception as e:
-                print(f"调用 fetchDoc 失败: {e}")
-                print(f"提示: 请确保本地 ANP 服务器正在运行 (ANP_DOMAIN: {ANP_DOMAIN})")
+            print(f"测试 URL: {TEST_URL}")
+            _print_tool_step("fetchDoc", fetch_result)
 
             # 演示调用 anp.invokeOpenRPC 工具（测试 echo 方法）
             print("\n=== 演示调用 anp.invokeOpenRPC 工具 (echo 方法) ===")
-            test_message = "Hello from MCP client!"
-            jsonrpc_endpoint = f"{ANP_DOMAIN}/agents/test/jsonrpc"
-            print(f"测试消息: {test_message}")
-            print(f"JSON-RPC 端点: {jsonrpc_endpoint}")
-            try:
-                rpc_result = await session.call_tool(
-                    "anp.invokeOpenRPC",
-                    arguments={
-                        "endpoint": jsonrpc_endpoint,
-                        "method": "echo",
-                        "params": {"message": test_message},
-                    },
-                )
-                print("\necho 方法调用结果:")
-                for content in rpc_result.content:
-                    content_dict = content.model_dump()
-                    if content_dict.get("type") == "text":
-                        try:
-                            text_data = json.loads(content_dict.get("text", "{}"))
-                            print(json.dumps(text_data, indent=2, ensure_ascii=False))
-                        except json.JSONDecodeError:
-                            print(content_dict.get("text"))
-            except Exception as e:
-                print(f"调用 echo 方法失败: {e}")
-                print(f"提示: 请确保本地 ANP 服务器正在运行 (ANP_DOMAIN: {ANP_DOMAIN})")
+            print(f"测试消息: {TEST_MESSAGE}")
+            print(f"JSON-RPC 端点: {JSONRPC_ENDPOINT}")
+            _print_tool_step("echo 方法", rpc_result)
 
             # 演示调用 anp.invokeOpenRPC 工具（测试 getStatus 方法）
             print("\n=== 演示调用 anp.invokeOpenRPC 工具 (getStatus 方法) ===")
-            print(f"JSON-RPC 端点: {jsonrpc_endpoint}")
-            try:
-                status_result = await session.call_tool(
-                    "anp.invokeOpenRPC",
-                    arguments={
-                        "endpoint": jsonrpc_endpoint,
-                        "method": "getStatus",
-                        "params": {},
-                    },
-                )
-                print("\ngetStatus 方法调用结果:")
-                for content in status_result.content:
-                    content_dict = content.model_dump()
-                    if content_dict.get("type") == "text":
-                        try:
-                            text_data = json.loads(content_dict.get("text", "{}"))
-                            print(json.dumps(text_data, indent=2, ensure_ascii=False))
-                        except json.JSONDecodeError:
-                            print(content_dict.get("text"))
-            except Exception as e:
-                print(f"调用 getStatus 方法失败: {e}")
-                print(f"提示: 请确保本地 ANP 服务器正在运行 (ANP_DOMAIN: {ANP_DOMAIN})")
+            print(f"JSON-RPC 端点: {JSONRPC_ENDPOINT}")
+            _print_tool_step("getStatus 方法", status_result)
 
 
 async def main():
     """主函数"""
     # 设置日志
-    logging.basicConfig(level=logging.INFO)
-    structlog.configure(
-        processors=[
-            structlog.stdlib.filter_by_level,
-            structlog.stdlib.add_logger_name,
-            structlog.stdlib.add_log_level,
-            structlog.stdlib.PositionalArgumentsFormatter(),
-            structlog.dev.ConsoleRenderer(),
-        ],
-        wrapper_class=structlog.stdlib.BoundLogger,
-        logger_factory=structlog.stdlib.LoggerFactory(),
-        cache_logger_on_first_use=True,
-    )
+    configure_logging()
 
     print("MCP2ANP 客户端演示 (使用官方 MCP SDK)")
     print("==========================================")
@@ -155,32 +186,16 @@ async def main():
         # 基本用法演示
         await demo_basic_usage()
 
-        print("\n=== 演示完成 ===")
-        print("演示内容包括:")
-        print("- anp.fetchDoc: 获取智能体描述文档")
-        print("- anp.invokeOpenRPC(echo): 调用回显方法测试连接")
-        print("- anp.invokeOpenRPC(getStatus): 获取智能体状态信息")
-        print("\n环境变量配置:")
-        print("- ANP_DID_DOCUMENT_PATH: 自定义 DID 文档路径")
-        print("- ANP_DID_PRIVATE_KEY_PATH: 自定义 DID 私钥路径")
-        print("（未设置时使用默认凭证）")
-        print("\n要在实际项目中使用，你可以:")
-        print("1. 导入 MCP SDK: from mcp import ClientSession, StdioServerParameters")
-        print("2. 导入 stdio_client: from mcp.client.stdio import stdio_client")
-        print("3. 配置服务器参数: server_params = StdioServerParameters(...)")
-        print("4. 使用 async with stdio_client(server_params) 创建连接")
-        print("5. 使用 async with ClientSession(read, write) 创建会话")
-        print("6. 调用 session.initialize() 初始化")
-        print("7. 使用 session.list_tools() 获取工具列表")
-        print("8. 使用 session.call_tool(name, arguments) 调用工具")
+        print(DEMO_SUMMARY)
 
     except KeyboardInterrupt:
         print("\n用户中断")
     except Exception as e:
-        logger.error("主程序执行失败", error=str(e))
+        logger.error("主程序执行失败: %s", e)
         print(f"程序执行失败: {e}")
         sys.exit(1)
 
 
 if __name__ == "__main__":
+    install_uvloop()
     asyncio.run(main())
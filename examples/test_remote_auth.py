@@ -22,10 +22,12 @@
 
 import asyncio
 import json
+import logging
+import socket
 import sys
 import time
 from asyncio.subprocess import Process
-from contextlib import suppress
+from contextlib import ExitStack, suppress
 
 import click
 import structlog
@@ -33,6 +35,8 @@ from mcp import ClientSession
 from mcp.client.streamable_http import streamablehttp_client
 from dataclasses import dataclass
 
+from _common import install_uvloop
+
 # --- 全局配置 ---
 logger = structlog.get_logger(__name__)
 
@@ -43,6 +47,19 @@ MCP_URL = "https://agent-connect.ai/mcp2anp/mcp"
 DEFAULT_API_KEY = "sk_mcp_6OIGY-42ZVG-4H2NU-CCI3L-IVHUV-6XWTI-5CY7I-K4CDW-54"
 
 
+def _find_free_ports(count: int) -> list[int]:
+    """绑定 0 端口，由操作系统分配 count 个互不相同的空闲端口。"""
+    with ExitStack() as stack:
+        sockets = [
+            stack.enter_context(socket.socket(socket.AF_INET, socket.SOCK_STREAM))
+            for _ in range(count)
+        ]
+        # 全部绑定后才统一释放，保证分配到的端口互不重复
+        for sock in sockets:
+            sock.bind((MCP_HOST, 0))
+        return [sock.getsockname()[1] for sock in sockets]
+
+
 # --- 集成测试器 ---
 
 
@@ -55,16 +72,21 @@ class RemoteServerClientTester:
         client_api_key: str | None,
         expect_success: bool,
         server_api_key: str | None,
+        port: int = MCP_PORT,
     ) -> bool:
         """
         运行一个客户端测试场景。
-        启动服务器，连接客户端，并尝试初始化会话。
+        在指定端口启动服务器，连接客户端，并尝试初始化会话。
+        各场景并发运行，日志与输出都带上场景名和端口以便区分。
         """
-        logger.info("=" * 60)
-        logger.info(f"测试场景: {name}")
+        log = logger.bind(scenario=name, port=port)
+        tag = f"[{name} @ {port}]"
+
+        log.info("=" * 60)
+        log.info(f"测试场景: {name}")
         display_key = client_api_key if client_api_key else DEFAULT_API_KEY
-        logger.info(f"API Key: '{display_key}', Expect Success: {expect_success}")
-        logger.info("=" * 60)
+        log.info(f"API Key: '{display_key}', Expect Success: {expect_success}")
+        log.info("=" * 60)
 
         headers = None
         if client_api_key:
@@ -75,96 +97,111 @@ class RemoteServerClientTester:
         server_process: Process | None = None
 
         try:
-            server_process = await self._launch_server(server_api_key)
+            server_process = await self._launch_server(server_api_key, port, log)
             if server_process is None:
-                logger.error("❌ 测试失败: 服务器进程未能启动。")
+                log.error("❌ 测试失败: 服务器进程未能启动。")
                 return False
 
-            if not await self._wait_for_server_ready(server_process):
-                logger.error("❌ 测试失败: 服务器未能在预期时间内就绪。")
+            if not await self._wait_for_server_ready(server_process, port, log=log):
+                log.error("❌ 测试失败: 服务器未能在预期时间内就绪。")
                 return False
 
             async with streamablehttp_client(
-                url=f"http://{MCP_HOST}:{MCP_PORT}/mcp",
+                url=f"http://{MCP_HOST}:{port}/mcp",
                 headers=headers,
             ) as (read, write, _):
                 async with ClientSession(read, write) as session:
-                    logger.info("尝试初始化 MCP 客户端会话...")
+                    log.info("尝试初始化 MCP 客户端会话...")
                     await session.initialize()
-                    logger.info("会话初始化成功。")
-
-                    tools_result = await session.list_tools()
-                    logger.info(f"成功列出 {len(tools_result.tools)} 个工具。")
+                    log.info("会话初始化成功。")
 
                     test_url = "https://agent-search.ai/agents/navigation/ad.json"
-                    print(f"URL: {test_url}\n")
+                    print(f"{tag} URL: {test_url}\n")
 
-                    try:
+                    async def fetch_doc():
                         start_time = time.monotonic()
                         result = await session.call_tool(
                             "anp_fetchDoc", arguments={"url": test_url}
                         )
                         end_time = time.monotonic()
-                        logger.info(
+                        log.info(
                             f"首次调用 anp_fetchDoc (含认证) 耗时: {end_time - start_time:.4f} 秒。"
                         )
-
-                        for content in result.content:
-                            if hasattr(content, "text"):
-                                try:
-                                    data = json.loads(content.text)
-                                    if not data.get("ok"):
-                                        print(
-                                            f"❌ 预期的错误: {data.get('error', {}).get('code')}"
-                                        )
-                                        print(
-                                            "   消息:"
-                                            f" {data.get('error', {}).get('message')}\n"
-                                        )
-                                except json.JSONDecodeError:
-                                    print(content.text)
-                    except Exception as fetch_error:
-                        logger.error(
+                        return result
+
+                    # 列出工具与调用工具互不依赖，在同一会话上并发发出
+                    tools_result, result = await asyncio.gather(
+                        session.list_tools(), fetch_doc(), return_exceptions=True
+                    )
+                    if isinstance(tools_result, BaseException):
+                        raise tools_result
+                    log.info(f"成功列出 {len(tools_result.tools)} 个工具。")
+
+                    if isinstance(result, BaseException):
+                        log.error(
                             "调用 anp.fetchDoc 失败",
-                            error=str(fetch_error),
+                            error=str(result),
                         )
                         if expect_success:
                             return False
+                    else:
+                        # 工具结果只有一个文本块，取到第一个即可，无需遍历全部内容
+                        content = next(
+                            (c for c in result.content if hasattr(c, "text")), None
+                        )
+                        if content is not None:
+                            try:
+                                data = json.loads(content.text)
+                                if not data.get("ok"):
+                                    print(
+                                        f"{tag} ❌ 预期的错误: "
+                                        f"{data.get('error', {}).get('code')}"
+                                    )
+                                    print(
+                                        f"{tag}    消息:"
+                                        f" {data.get('error', {}).get('message')}\n"
+                                    )
+                            except json.JSONDecodeError:
+                                print(f"{tag} {content.text}")
 
                     if not expect_success:
-                        logger.error("❌ 测试失败: 期望会话初始化失败，但它成功了。")
+                        log.error("❌ 测试失败: 期望会话初始化失败，但它成功了。")
                         return False
 
-                    logger.info("✅ 测试通过: 客户端成功连接并操作服务器。")
+                    log.info("✅ 测试通过: 客户端成功连接并操作服务器。")
                     return True
 
         except Exception as e:
             if expect_success:
-                logger.error(f"❌ 测试失败: 期望成功，但捕获到异常: {e}")
+                log.error(f"❌ 测试失败: 期望成功，但捕获到异常: {e}")
                 return False
 
-            logger.info(f"✅ 测试通过: 正确捕获到预期的异常: {e}")
+            log.info(f"✅ 测试通过: 正确捕获到预期的异常: {e}")
             if "AUTHENTICATION_FAILED" in str(e):
-                logger.info("错误消息包含 'AUTHENTICATION_FAILED'，符合预期。")
+                log.info("错误消息包含 'AUTHENTICATION_FAILED'，符合预期。")
             else:
-                logger.warning(
+                log.warning(
                     f"错误消息不含 'AUTHENTICATION_FAILED'，但仍视为通过: {e}"
                 )
             return True
         finally:
             if server_process is not None:
-                await self._stop_server(server_process)
+                await self._stop_server(server_process, log)
 
-    async def _launch_server(self, server_api_key: str | None) -> Process | None:
+    async def _launch_server(
+        self,
+        server_api_key: str | None,
+        port: int = MCP_PORT,
+        log: structlog.typing.FilteringBoundLogger = logger,
+    ) -> Process | None:
         """启动 server_remote.py 子进程。"""
+        # 直接使用当前解释器，避免每次启动都经过 uv 的环境校验
         cmd = [
-            "uv",
-            "run",
-            "python",
+            sys.executable,
             "-m",
             "mcp2anp.server_remote",
             f"--host={MCP_HOST}",
-            f"--port={MCP_PORT}",
+            f"--port={port}",
             "--log-level=WARNING",
         ]
 
@@ -175,24 +212,28 @@ class RemoteServerClientTester:
                 ]
             )
 
-        logger.info("启动 server_remote 子进程", command=" ".join(cmd))
+        log.info("启动 server_remote 子进程", command=" ".join(cmd))
 
         try:
             process = await asyncio.create_subprocess_exec(*cmd)
             return process
         except FileNotFoundError as e:
-            logger.error("未能找到 uv 可执行文件", error=str(e))
+            log.error("未能找到 Python 解释器", error=str(e))
             return None
 
     async def _wait_for_server_ready(
-        self, process: Process, timeout: float = 15.0
+        self,
+        process: Process,
+        port: int = MCP_PORT,
+        timeout: float = 15.0,
+        log: structlog.typing.FilteringBoundLogger = logger,
     ) -> bool:
         """等待服务器在指定超时内开始监听端口。"""
         deadline = asyncio.get_running_loop().time() + timeout
 
         while True:
             if process.returncode is not None:
-                logger.error(
+                log.error(
                     "server_remote 提前退出",
                     returncode=process.returncode,
                 )
@@ -200,29 +241,31 @@ class RemoteServerClientTester:
 
             try:
                 reader, writer = await asyncio.wait_for(
-                    asyncio.open_connection(MCP_HOST, MCP_PORT), timeout=1.0
+                    asyncio.open_connection(MCP_HOST, port), timeout=1.0
                 )
                 writer.close()
                 await writer.wait_closed()
-                logger.info("server_remote 已开始监听", host=MCP_HOST, port=MCP_PORT)
+                log.info("server_remote 已开始监听", host=MCP_HOST, port=port)
                 return True
             except (TimeoutError, ConnectionRefusedError, OSError):
                 if asyncio.get_running_loop().time() >= deadline:
                     return False
                 await asyncio.sleep(0.3)
 
-    async def _stop_server(self, process: Process) -> None:
+    async def _stop_server(
+        self, process: Process, log: structlog.typing.FilteringBoundLogger = logger
+    ) -> None:
         """终止 server_remote 子进程。"""
         if process.returncode is not None:
             return
 
-        logger.info("停止 server_remote 子进程")
+        log.info("停止 server_remote 子进程")
         process.terminate()
 
         try:
             await asyncio.wait_for(process.wait(), timeout=5.0)
         except TimeoutError:
-            logger.warning("子进程未在超时内退出，尝试强制 kill")
+            log.warning("子进程未在超时内退出，尝试强制 kill")
             process.kill()
             with suppress(asyncio.TimeoutError):
                 await asyncio.wait_for(process.wait(), timeout=5.0)
@@ -233,31 +276,37 @@ class RemoteServerClientTester:
         logger.info("开始 `server_remote` 端到端客户端集成测试")
         logger.info("=" * 60)
 
-        results = {}
-
-        # 场景 1: 使用提供的有效 API Key
-        results["使用有效密钥"] = await self.run_client_test(
-            "使用有效密钥",
-            client_api_key=valid_api_key,
-            expect_success=True,
-            server_api_key=valid_api_key,
-        )
-
-        # 场景 2: 不使用 API Key (预期失败)
-        results["不使用密钥 (预期失败)"] = await self.run_client_test(
-            "不使用密钥 (预期失败)",
-            client_api_key=None,
-            expect_success=False,
-            server_api_key=None,
-        )
-
-        # 场景 3: 使用无效的 API Key
-        results["使用无效密钥"] = await self.run_client_test(
-            "使用无效密钥",
-            client_api_key="invalid-key",
-            expect_success=False,
-            server_api_key=valid_api_key,
+        scenarios = {
+            # 场景 1: 使用提供的有效 API Key
+            "使用有效密钥": dict(
+                client_api_key=valid_api_key,
+                expect_success=True,
+                server_api_key=valid_api_key,
+            ),
+            # 场景 2: 不使用 API Key (预期失败)
+            "不使用密钥 (预期失败)": dict(
+                client_api_key=None,
+                expect_success=False,
+                server_api_key=None,
+            ),
+            # 场景 3: 使用无效的 API Key
+            "使用无效密钥": dict(
+                client_api_key="invalid-key",
+                expect_success=False,
+                server_api_key=valid_api_key,
+            ),
+        }
+
+        # 各场景互不依赖，每个场景在系统分配的空闲端口上启动自己的服务器并发运行，
+        # 避免与 9880 之后的固定端口（如 server_http 默认的 9881）冲突
+        ports = _find_free_ports(len(scenarios))
+        outcomes = await asyncio.gather(
+            *(
+                self.run_client_test(name, port=port, **kwargs)
+                for port, (name, kwargs) in zip(ports, scenarios.items())
+            )
         )
+        results = dict(zip(scenarios, outcomes))
 
         logger.info("=" * 60)
         logger.info("测试结果汇总")
@@ -297,9 +346,13 @@ def main(valid_api_key: str):
             structlog.processors.add_log_level,
             structlog.processors.TimeStamper(fmt="iso"),
             structlog.dev.ConsoleRenderer(),
-        ]
+        ],
+        wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
+        cache_logger_on_first_use=True,
     )
 
+    install_uvloop()
+
     tester = RemoteServerClientTester()
     try:
         asyncio.run(tester.run_all_tests(valid_api_key))
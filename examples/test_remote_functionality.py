@@ -6,71 +6,93 @@ import json
 
 import httpx
 
+from _common import install_uvloop, pretty_json, preview_json
+
+# 所有请求共用的头部，在客户端上设置一次，由 httpx 合并到每个请求
+BASE_HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json, text/event-stream"
+}
+
+# initialize 请求体每次运行都相同，模块加载时预先序列化
+INIT_BODY = json.dumps({
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2024-11-05",
+        "capabilities": {},
+        "clientInfo": {
+            "name": "test-client",
+            "version": "1.0.0"
+        }
+    }
+}).encode()
+
+# 会话建立后依次发送的工具调用
+TOOLS_LIST_REQUEST = {
+    "jsonrpc": "2.0",
+    "id": 2,
+    "method": "tools/list"
+}
+FETCH_DOC_REQUEST = {
+    "jsonrpc": "2.0",
+    "id": 3,
+    "method": "tools/call",
+    "params": {
+        "name": "anp_fetchDoc",
+        "arguments": {
+            "url": "https://agent-navigation.com/ad.json"
+        }
+    }
+}
+
+
+async def initialize_session(client: httpx.AsyncClient, url: str) -> str | None:
+    """完成 MCP initialize 握手并返回会话 ID，后续调用都复用该会话。"""
+    init_response = await client.post(url, content=INIT_BODY)
+
+    print(f"状态码: {init_response.status_code}")
+    print(f"响应: {pretty_json(init_response.json())}")
+
+    return init_response.headers.get("X-MCP-Session-Id")
+
 
 async def test_remote_server():
     """测试远程 MCP 服务器的功能。"""
     base_url = "http://127.0.0.1:9880"
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    # 单个会话的请求是串行的，少量长连接即可满足
+    limits = httpx.Limits(max_connections=4, max_keepalive_connections=4)
+    async with httpx.AsyncClient(
+        timeout=30.0, headers=BASE_HEADERS, limits=limits
+    ) as client:
         print("=" * 60)
         print("测试 1: 初始化会话")
         print("=" * 60)
 
         # 初始化会话
-        init_response = await client.post(
-            f"{base_url}/mcp",
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json, text/event-stream"
-            },
-            json={
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "initialize",
-                "params": {
-                    "protocolVersion": "2024-11-05",
-                    "capabilities": {},
-                    "clientInfo": {
-                        "name": "test-client",
-                        "version": "1.0.0"
-                    }
-                }
-            }
-        )
-
-        print(f"状态码: {init_response.status_code}")
-        print(f"响应: {json.dumps(init_response.json(), indent=2, ensure_ascii=False)}")
-
-        # 提取会话 ID
-        session_id = init_response.headers.get("X-MCP-Session-Id")
+        session_id = await initialize_session(client, f"{base_url}/mcp")
         if not session_id:
             print("\n❌ 未能获取会话 ID")
             return
 
         print(f"\n✅ 会话 ID: {session_id}")
 
+        session_headers = {"X-MCP-Session-Id": session_id}
+
         print("\n" + "=" * 60)
         print("测试 2: 获取工具列表")
         print("=" * 60)
 
         # 获取工具列表
         tools_response = await client.post(
-            f"{base_url}/mcp",
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json, text/event-stream",
-                "X-MCP-Session-Id": session_id
-            },
-            json={
-                "jsonrpc": "2.0",
-                "id": 2,
-                "method": "tools/list"
-            }
+            f"{base_url}/mcp", headers=session_headers, json=TOOLS_LIST_REQUEST
         )
 
         print(f"状态码: {tools_response.status_code}")
         tools_result = tools_response.json()
-        print(f"响应: {json.dumps(tools_result, indent=2, ensure_ascii=False)}")
+        print(f"响应: {pretty_json(tools_result)}")
 
         if "result" in tools_result and "tools" in tools_result["result"]:
             tools = tools_result["result"]["tools"]
@@ -84,28 +106,12 @@ async def test_remote_server():
 
         # 调用 anp_fetchDoc 工具
         fetch_response = await client.post(
-            f"{base_url}/mcp",
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json, text/event-stream",
-                "X-MCP-Session-Id": session_id
-            },
-            json={
-                "jsonrpc": "2.0",
-                "id": 3,
-                "method": "tools/call",
-                "params": {
-                    "name": "anp_fetchDoc",
-                    "arguments": {
-                        "url": "https://agent-navigation.com/ad.json"
-                    }
-                }
-            }
+            f"{base_url}/mcp", headers=session_headers, json=FETCH_DOC_REQUEST
         )
 
         print(f"状态码: {fetch_response.status_code}")
         fetch_result = fetch_response.json()
-        print(f"响应: {json.dumps(fetch_result, indent=2, ensure_ascii=False)[:1000]}...")
+        print(f"响应: {preview_json(fetch_result, 1000)}...")
 
         if "result" in fetch_result:
             print("\n✅ anp_fetchDoc 调用成功")
@@ -118,4 +124,5 @@ async def test_remote_server():
 
 
 if __name__ == "__main__":
+    install_uvloop()
     asyncio.run(test_remote_server())
@@ -13,10 +13,12 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import Any
 
 import httpx
 import pytest
+import pytest_asyncio
 
 # ---------------------- 硬编码配置
 BASE_URL = "https://agent-connect.ai/http2anp"  # 已运行的后端地址
@@ -31,48 +33,47 @@ def base_url() -> str:
     return BASE_URL.rstrip("/")
 
 
-@pytest.fixture(scope="session", autouse=True)
-def _server_reachable(base_url):
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def client(base_url):
+    """会话级客户端：所有用例共享同一连接池，避免每个用例重新建立 TCP/TLS 连接。"""
+    # 用例最多并发 3 个请求；放宽空闲过期时间，使连接能跨用例保持复用
+    limits = httpx.Limits(
+        max_connections=10, max_keepalive_connections=10, keepalive_expiry=60.0
+    )
+    async with httpx.AsyncClient(
+        base_url=base_url, timeout=10.0, limits=limits, trust_env=False
+    ) as c:
+        yield c
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session", autouse=True)
+async def _server_reachable(client: httpx.AsyncClient):
     """
     会话级探活：如果服务器不可达，则跳过整个测试套。
     首选探测 /openapi.json；若不存在则尝试 OPTIONS /anp.fetchDoc。
+    复用用例共享的客户端，探活建立的连接随后直接被第一个用例使用。
     """
     try:
-        with httpx.Client(base_url=base_url, timeout=2.0, trust_env=False) as c:
-            r = c.get("/openapi.json")
-            if r.status_code < 500:
-                return
-            r = c.options("/anp.fetchDoc")
-            if r.status_code < 500:
-                return
+        r = await client.get("/openapi.json", timeout=2.0)
+        if r.status_code < 500:
+            return
+        r = await client.options("/anp.fetchDoc", timeout=2.0)
+        if r.status_code < 500:
+            return
     except Exception as e:
         pytest.skip(f"后端未就绪或不可达：{e!r}")
 
 
-@pytest.fixture
-async def client(base_url):
-    async with httpx.AsyncClient(base_url=base_url, timeout=10.0, trust_env=False) as c:
-        yield c
+# ---------------------- 用例：http2anp.fetchDoc（参数化鉴权） ----------------------
+AUTH_CASES = [
+    ("valid", {API_KEY_HEADER: VALID_KEY}, 200, True),
+    ("missing", {}, 401, False),
+    ("invalid", {API_KEY_HEADER: "invalid-key"}, 401, False),
+]
+FETCH_DOC_BODY = {"url": "https://agent-navigation.com/ad.json"}
 
 
-# ---------------------- 用例：http2anp.fetchDoc（参数化鉴权） ----------------------
-@pytest.mark.asyncio
-@pytest.mark.parametrize(
-    "case,headers,expect_status,expect_ok",
-    [
-        ("valid", {API_KEY_HEADER: VALID_KEY}, 200, True),
-        ("missing", {}, 401, False),
-        ("invalid", {API_KEY_HEADER: "invalid-key"}, 401, False),
-    ],
-)
-async def test_fetch_doc_auth_cases(
-    client: httpx.AsyncClient, case, headers, expect_status, expect_ok
-):
-    r = await client.post(
-        "/anp.fetchDoc",
-        headers=headers,
-        json={"url": "https://agent-navigation.com/ad.json"},
-    )
+def _check_auth_case(case, r: httpx.Response, expect_status, expect_ok):
     assert r.status_code == expect_status, f"{case} -> {r.text}"
     body = r.json()
 
@@ -88,8 +89,31 @@ async def test_fetch_doc_auth_cases(
             assert "Invalid" in body["detail"] or "expired" in body["detail"]
 
 
+@pytest.mark.slow
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.parametrize("case,headers,expect_status,expect_ok", AUTH_CASES)
+async def test_fetch_doc_auth_cases(
+    client: httpx.AsyncClient, case, headers, expect_status, expect_ok
+):
+    r = await client.post("/anp.fetchDoc", headers=headers, json=FETCH_DOC_BODY)
+    _check_auth_case(case, r, expect_status, expect_ok)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_fetch_doc_auth_all_concurrent(client: httpx.AsyncClient):
+    """三种鉴权场景互不依赖，并发发出，总耗时约为单次往返。"""
+    responses = await asyncio.gather(
+        *(
+            client.post("/anp.fetchDoc", headers=headers, json=FETCH_DOC_BODY)
+            for _, headers, _, _ in AUTH_CASES
+        )
+    )
+    for (case, _, expect_status, expect_ok), r in zip(AUTH_CASES, responses):
+        _check_auth_case(case, r, expect_status, expect_ok)
+
+
 # ---------------------- 用例：请求体验证（422） ----------------------
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 async def test_fetch_doc_validation_error(client: httpx.AsyncClient):
     r = await client.post(
         "/anp.fetchDoc",
@@ -108,7 +132,7 @@ async def test_fetch_doc_validation_error(client: httpx.AsyncClient):
 
 
 # ---------------------- 用例：http2anp.invokeOpenRPC（成功路径，可选） ----------------------
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 async def test_invoke_openrpc_success(client: httpx.AsyncClient):
     payload: dict[str, Any] = {
         "endpoint": "https://api.example.com/openrpc.json",
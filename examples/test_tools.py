@@ -2,9 +2,13 @@
 """测试 MCP 工具功能的脚本。"""
 
 import asyncio
+import sys
+
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 
+from _common import install_uvloop
+
 
 async def test_tools():
     """测试 MCP 工具功能。"""
@@ -12,10 +16,10 @@ async def test_tools():
     print("测试 MCP 工具功能")
     print("=" * 60)
 
-    # 使用 stdio 传输测试本地服务器
+    # 使用 stdio 传输测试本地服务器；直接用当前解释器启动，省去 uv run 的环境解析
     server_params = StdioServerParameters(
-        command="uv",
-        args=["run", "python", "-m", "mcp2anp.server"]
+        command=sys.executable,
+        args=["-m", "mcp2anp.server"]
     )
 
     async with stdio_client(server_params) as (read, write):
@@ -41,9 +45,12 @@ async def test_tools():
             print("=" * 60)
 
             try:
-                fetch_result = await session.call_tool(
-                    "anp_fetchDoc",
-                    {"url": "https://agent-navigation.com/ad.json"}
+                fetch_result = await asyncio.wait_for(
+                    session.call_tool(
+                        "anp_fetchDoc",
+                        {"url": "https://agent-navigation.com/ad.json"}
+                    ),
+                    timeout=30.0,
                 )
                 print(f"✅ anp_fetchDoc 调用成功")
                 print(f"结果长度: {len(fetch_result.content[0].text)} 字符")
@@ -69,4 +76,5 @@ async def test_tools():
 
 
 if __name__ == "__main__":
+    install_uvloop()
     asyncio.run(test_tools())
@@ -13,6 +13,45 @@ from pathlib import Path
 
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
+from mcp.types import TextContent
+
+from _common import install_uvloop, pretty_json, preview_json
+
+# 项目根目录与公共 DID 凭证目录
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DID_PUBLIC_DIR = PROJECT_ROOT / "docs" / "did_public"
+
+# 单次工具调用的最长等待时间（秒），防止某一步卡住整个测试
+TOOL_CALL_TIMEOUT = 30.0
+
+
+async def call_tool(session: ClientSession, name: str, arguments: dict):
+    """在同一会话上调用工具，并用超时保护。"""
+    return await asyncio.wait_for(
+        session.call_tool(name, arguments=arguments), timeout=TOOL_CALL_TIMEOUT
+    )
+
+
+def first_json(result) -> dict | None:
+    """解析工具结果中的第一个文本块（工具只返回一个 JSON 文本块）。
+
+    非 JSON 文本会原样打印并返回 None。
+    """
+    content = next((c for c in result.content if isinstance(c, TextContent)), None)
+    if content is None:
+        return None
+    try:
+        return json.loads(content.text)
+    except json.JSONDecodeError:
+        print(content.text)
+        return None
+
+
+def print_error(data: dict, label: str = "获取失败") -> None:
+    """打印工具返回的错误码与错误消息。"""
+    error = data.get('error', {})
+    print(f"❌ {label}: {error.get('code')}")
+    print(f"   消息: {error.get('message')}")
 
 
 async def test_anp_server():
@@ -21,15 +60,12 @@ async def test_anp_server():
 
     # 配置 MCP 服务器参数
     # 服务器会自动使用默认的 DID 凭证或环境变量中的凭证
-    # 获取项目根目录
-    project_root = Path(__file__).parent.parent
-
     server_params = StdioServerParameters(
         command="uv",
         args=["run", "python", "-m", "mcp2anp.server"],
         env={
-            "ANP_DID_DOCUMENT_PATH": str(project_root / "docs" / "did_public" / "public-did-doc.json"),
-            "ANP_DID_PRIVATE_KEY_PATH": str(project_root / "docs" / "did_public" / "public-private-key.pem")
+            "ANP_DID_DOCUMENT_PATH": str(DID_PUBLIC_DIR / "public-did-doc.json"),
+            "ANP_DID_PRIVATE_KEY_PATH": str(DID_PUBLIC_DIR / "public-private-key.pem")
         }
     )
 
@@ -43,25 +79,22 @@ async def test_anp_server():
             entry_url = "https://agent-navigation.com/ad.json"
             print(f"URL: {entry_url}\n")
 
-            result = await session.call_tool(
+            result = await call_tool(
+                session,
                 "anp.fetchDoc",
                 arguments={"url": entry_url}
             )
 
             agent_description = None
-            for content in result.content:
-                if hasattr(content, 'text'):
-                    try:
-                        data = json.loads(content.text)
-                        if data.get('ok'):
-                            print("✅ 成功获取入口文档！")
-                            print(json.dumps(data, indent=2, ensure_ascii=False))
-                            agent_description = data.get('json', {})
-                        else:
-                            print(f"❌ 获取失败: {data.get('error', {}).get('code')}")
-                            print(f"   消息: {data.get('error', {}).get('message')}\n")
-                    except json.JSONDecodeError:
-                        print(content.text)
+            data = first_json(result)
+            if data is not None:
+                if data.get('ok'):
+                    print("✅ 成功获取入口文档！")
+                    print(pretty_json(data))
+                    agent_description = data.get('json', {})
+                else:
+                    print_error(data)
+                    print()
 
             print("\n" + "="*60 + "\n")
 
@@ -74,37 +107,35 @@ async def test_anp_server():
                 print(f"智能体: {first_agent.get('name')}")
                 print(f"URL: {agent_url}\n")
 
-                agent_result = await session.call_tool(
+                agent_result = await call_tool(
+                    session,
                     "anp.fetchDoc",
                     arguments={"url": agent_url}
                 )
 
                 agent_detail = None
-                for content in agent_result.content:
-                    if hasattr(content, 'text'):
-                        try:
-                            data = json.loads(content.text)
-                            if data.get('ok'):
-                                print("✅ 成功获取智能体详情！")
-                                print(json.dumps(data, indent=2, ensure_ascii=False))
-                                agent_detail = data.get('json', {})
-                            else:
-                                print(f"❌ 获取失败: {data.get('error', {}).get('code')}")
-                                print(f"   消息: {data.get('error', {}).get('message')}")
-                        except json.JSONDecodeError:
-                            print(content.text)
+                data = first_json(agent_result)
+                if data is not None:
+                    if data.get('ok'):
+                        print("✅ 成功获取智能体详情！")
+                        print(pretty_json(data))
+                        agent_detail = data.get('json', {})
+                    else:
+                        print_error(data)
 
                 print("\n" + "="*60 + "\n")
 
                 # 步骤 3: 如果智能体有 OpenRPC 接口，尝试调用
                 if agent_detail:
-                    # 从 interfaces 中查找 OpenRPC 接口
-                    openrpc_interface = None
-                    interfaces = agent_detail.get('interfaces', [])
-                    for interface in interfaces:
-                        if interface.get('protocol') == 'openrpc':
-                            openrpc_interface = interface
-                            break
+                    # 从 interfaces 中查找第一个 OpenRPC 接口（找到即停止扫描）
+                    openrpc_interface = next(
+                        (
+                            interface
+                            for interface in agent_detail.get('interfaces', [])
+                            if interface.get('protocol') == 'openrpc'
+                        ),
+                        None,
+                    )
 
                     if openrpc_interface:
                         interface_url = openrpc_interface.get('url')
@@ -113,33 +144,29 @@ async def test_anp_server():
                         print(f"URL: {interface_url}\n")
 
                         # 获取接口定义
-                        interface_result = await session.call_tool(
+                        interface_result = await call_tool(
+                            session,
                             "anp.fetchDoc",
                             arguments={"url": interface_url}
                         )
 
                         interface_def = None
-                        for content in interface_result.content:
-                            if hasattr(content, 'text'):
-                                try:
-                                    data = json.loads(content.text)
-                                    if data.get('ok'):
-                                        print("✅ 成功获取 OpenRPC 接口定义！")
-                                        # 只打印部分内容，因为接口定义可能很长
-                                        interface_def = data.get('json', {})
-                                        print(f"OpenRPC 版本: {interface_def.get('openrpc')}")
-                                        print(f"服务名称: {interface_def.get('info', {}).get('title')}")
-                                        methods = interface_def.get('methods', [])
-                                        print(f"可用方法数量: {len(methods)}")
-                                        if methods:
-                                            print("\n前 3 个方法:")
-                                            for method in methods[:3]:
-                                                print(f"  - {method.get('name')}: {method.get('summary', 'N/A')}")
-                                    else:
-                                        print(f"❌ 获取失败: {data.get('error', {}).get('code')}")
-                                        print(f"   消息: {data.get('error', {}).get('message')}")
-                                except json.JSONDecodeError:
-                                    print(content.text)
+                        data = first_json(interface_result)
+                        if data is not None:
+                            if data.get('ok'):
+                                print("✅ 成功获取 OpenRPC 接口定义！")
+                                # 只打印部分内容，因为接口定义可能很长
+                                interface_def = data.get('json', {})
+                                print(f"OpenRPC 版本: {interface_def.get('openrpc')}")
+                                print(f"服务名称: {interface_def.get('info', {}).get('title')}")
+                                methods = interface_def.get('methods', [])
+                                print(f"可用方法数量: {len(methods)}")
+                                if methods:
+                                    print("\n前 3 个方法:")
+                                    for method in methods[:3]:
+                                        print(f"  - {method.get('name')}: {method.get('summary', 'N/A')}")
+                            else:
+                                print_error(data)
 
                         # 步骤 4: 调用 OpenRPC 方法
                         if interface_def:
@@ -159,7 +186,8 @@ async def test_anp_server():
                                     print(f"方法: {method_name}")
                                     print("参数: 搜索北京的酒店\n")
 
-                                    rpc_call_result = await session.call_tool(
+                                    rpc_call_result = await call_tool(
+                                        session,
                                         "anp.invokeOpenRPC",
                                         arguments={
                                             "endpoint": rpc_endpoint,
@@ -172,26 +200,21 @@ async def test_anp_server():
                                         }
                                     )
 
-                                    for content in rpc_call_result.content:
-                                        if hasattr(content, 'text'):
-                                            try:
-                                                data = json.loads(content.text)
-                                                if data.get('ok'):
-                                                    print("✅ 成功调用 OpenRPC 方法！")
-                                                    result = data.get('result', {})
-                                                    # 打印结果摘要
-                                                    if isinstance(result, dict):
-                                                        print(f"结果类型: {type(result).__name__}")
-                                                        print(f"结果键数量: {len(result.keys())}")
-                                                        print("\n结果预览:")
-                                                        print(json.dumps(result, indent=2, ensure_ascii=False)[:500] + "...")
-                                                    else:
-                                                        print(f"结果: {result}")
-                                                else:
-                                                    print(f"❌ 调用失败: {data.get('error', {}).get('code')}")
-                                                    print(f"   消息: {data.get('error', {}).get('message')}")
-                                            except json.JSONDecodeError:
-                                                print(content.text)
+                                    data = first_json(rpc_call_result)
+                                    if data is not None:
+                                        if data.get('ok'):
+                                            print("✅ 成功调用 OpenRPC 方法！")
+                                            result = data.get('result', {})
+                                            # 打印结果摘要
+                                            if isinstance(result, dict):
+                                                print(f"结果类型: {type(result).__name__}")
+                                                print(f"结果键数量: {len(result.keys())}")
+                                                print("\n结果预览:")
+                                                print(preview_json(result, 500) + "...")
+                                            else:
+                                                print(f"结果: {result}")
+                                        else:
+                                            print_error(data, "调用失败")
                                 else:
                                     print("\n步骤 4: 跳过（接口定义中没有服务器端点）")
                     else:
@@ -216,5 +239,6 @@ async def main():
 
 
 if __name__ == "__main__":
+    install_uvloop()
     asyncio.run(main())
 
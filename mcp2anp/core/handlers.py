@@ -12,6 +12,13 @@ from ..utils import models
 
 logger = structlog.get_logger(__name__)
 
+# 默认公共 DID 凭证（环境变量未设置时使用）
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DEFAULT_DID_DOCUMENT_PATH = PROJECT_ROOT / "docs" / "did_public" / "public-did-doc.json"
+DEFAULT_DID_PRIVATE_KEY_PATH = (
+    PROJECT_ROOT / "docs" / "did_public" / "public-private-key.pem"
+)
+
 
 class ANPHandler:
     """ANP 工具处理类。"""
@@ -40,38 +47,23 @@ class ANPHandler:
             # 使用 ANPCrawler 获取文档
             content_result, interfaces = await self.anp_crawler.fetch_text(request.url)
 
-            # 构建链接列表
-            links = []
-            for interface in interfaces:
-                func_info = interface.get("function", {})
-                links.append({
-                    "rel": "interface",
-                    "url": request.url,  # ANPCrawler 已经处理了 URL 解析
-                    "title": func_info.get("name", ""),
-                    "description": func_info.get("description", ""),
-                })
-
+            content = content_result.get("content", "")
             result = {
                 "ok": True,
                 "contentType": content_result.get("content_type", "application/json"),
-                "text": content_result.get("content", ""),
-                # "interfaces": links,
             }
 
-            # 如果内容是 JSON，尝试解析
-            try:
-                if content_result.get("content"):
-                    json_data = json.loads(content_result["content"])
-                    result["json"] = json_data
-
-                    # 删除 text字段，只保留一个
-                    result.pop("text")
-
-            except json.JSONDecodeError:
-                pass  # 不是 JSON 内容，跳过
+            # 如果内容是 JSON，只返回解析结果；否则返回原始文本（两者只保留一个）
+            if content:
+                try:
+                    result["json"] = json.loads(content)
+                except json.JSONDecodeError:
+                    result["text"] = content  # 不是 JSON 内容，保留原文
+            else:
+                result["text"] = content
 
             logger.info("Document fetched successfully",
-                        url=request.url, links_count=len(links))
+                        url=request.url, links_count=len(interfaces))
             return result
 
         except Exception as e:
@@ -131,8 +123,8 @@ class ANPHandler:
 
             logger.info("OpenRPC method invoked successfully",
                         method=request.method)
-            logger.info(
-                f"result:{json.dumps(result, indent=2, ensure_ascii=False)}")
+            # 以结构化字段记录完整结果，仅在 DEBUG 级别由渲染器序列化
+            logger.debug("OpenRPC result", result=result)
             return {
                 "ok": True,
                 "result": result,
@@ -169,11 +161,8 @@ def initialize_anp_crawler() -> ANPCrawler | None:
 
     # 如果环境变量未设置，使用默认的公共 DID 凭证
     if not did_document_path or not did_private_key_path:
-        project_root = Path(__file__).parent.parent.parent
-        did_document_path = str(
-            project_root / "docs" / "did_public" / "public-did-doc.json")
-        did_private_key_path = str(
-            project_root / "docs" / "did_public" / "public-private-key.pem")
+        did_document_path = str(DEFAULT_DID_DOCUMENT_PATH)
+        did_private_key_path = str(DEFAULT_DID_PRIVATE_KEY_PATH)
         logger.info(
             "Using default DID credentials",
             did_doc=did_document_path,
@@ -198,3 +187,4 @@ def initialize_anp_crawler() -> ANPCrawler | None:
     except Exception as e:
         logger.error("Failed to initialize ANPCrawler", error=str(e))
         return None
+
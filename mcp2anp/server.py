@@ -110,8 +110,9 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextConten
             raise ValueError(f"Unknown tool: {name}")
 
         # 将结果转换为字符串格式返回
-        logger.info(f"result length: {len(json.dumps(result, indent=2, ensure_ascii=False))}")
-        return [TextContent(type="text", text=json.dumps(result, indent=2, ensure_ascii=False))]
+        text = json.dumps(result, indent=2, ensure_ascii=False)
+        logger.info(f"result length: {len(text)}")
+        return [TextContent(type="text", text=text)]
 
     except Exception as e:
         logger.error("Tool execution failed", tool_name=name, error=str(e))
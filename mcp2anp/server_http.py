@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
 import logging
 import random
+import time
+from collections import OrderedDict
 from collections.abc import AsyncIterator
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 
 import click
@@ -36,13 +40,20 @@ class Settings(BaseSettings):
     auth_verify_path: str = "/api/v1/mcp-sk-api-keys/verify"
     api_key_header: str = "X-API-Key"
     auth_timeout_s: float = 15.0
+    # Seconds a successful key verification is reused; 0 disables the cache
+    auth_cache_ttl_s: float = 60.0
 
 
 _settings_override: dict[str, Any] = {}
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Return settings with CLI overrides."""
+    """Return settings with CLI overrides.
+
+    Settings are resolved once and reused by every request; call
+    ``get_settings.cache_clear()`` after changing ``_settings_override``.
+    """
     return Settings(**_settings_override)
 
 
@@ -240,15 +251,41 @@ async def auth_call(
 # --------------------------------------------------------------------------- #
 
 
-async def verify_api_key(
-    request: Request, settings: Settings = Depends(get_settings)
-) -> SessionConfig:
-    """Validate X-API-Key via remote service and return SessionConfig."""
-    token = request.headers.get(settings.api_key_header, "").strip()
-    if not token:
-        logger.warning("Missing API key header")
-        raise AuthFailure("Missing X-API-Key")
+# Successful verifications, keyed by a digest of the API key so raw keys are
+# not retained. Bounded LRU; entries expire after ``auth_cache_ttl_s``.
+_AUTH_CACHE_MAXSIZE = 1024
+_auth_cache: OrderedDict[str, tuple[float, SessionConfig]] = OrderedDict()
+
+# In-flight verifications keyed like the cache: concurrent requests carrying the
+# same API key share one remote call instead of each issuing their own.
+_auth_inflight: dict[str, asyncio.Task[SessionConfig]] = {}
 
+
+def _auth_cache_get(key: str) -> SessionConfig | None:
+    """Return a cached SessionConfig if present and not expired."""
+    entry = _auth_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, cfg = entry
+    if time.monotonic() >= expires_at:
+        del _auth_cache[key]
+        return None
+    _auth_cache.move_to_end(key)
+    return cfg
+
+
+def _auth_cache_put(key: str, cfg: SessionConfig, ttl: float) -> None:
+    """Store a verified SessionConfig, evicting the least recently used entry."""
+    _auth_cache[key] = (time.monotonic() + ttl, cfg)
+    _auth_cache.move_to_end(key)
+    while len(_auth_cache) > _AUTH_CACHE_MAXSIZE:
+        _auth_cache.popitem(last=False)
+
+
+async def _verify_remote(
+    client: httpx.AsyncClient, settings: Settings, token: str
+) -> SessionConfig:
+    """Verify the API key against the remote auth service."""
     verify_url = f"{settings.auth_base_url}{settings.auth_verify_path}"
     logger.info(
         "verifying api key",
@@ -258,7 +295,7 @@ async def verify_api_key(
 
     try:
         resp = await auth_call(
-            client=request.app.state.http,
+            client=client,
             url=verify_url,
             headers={settings.api_key_header: token},
             attempts=3,
@@ -287,6 +324,63 @@ async def verify_api_key(
         raise AuthFailure("Auth service unreachable") from e
 
 
+async def _verify_and_cache(
+    client: httpx.AsyncClient, settings: Settings, token: str, key: str
+) -> SessionConfig:
+    """Run one shared remote verification and cache its successful result."""
+    try:
+        cfg = await _verify_remote(client, settings, token)
+        if settings.auth_cache_ttl_s > 0:
+            _auth_cache_put(key, cfg, settings.auth_cache_ttl_s)
+        return cfg
+    finally:
+        _auth_inflight.pop(key, None)
+
+
+def _retrieve_task_exception(task: asyncio.Task[SessionConfig]) -> None:
+    """Mark a shared verification's exception as retrieved.
+
+    If every waiter was cancelled, nobody awaits the task's result, and asyncio
+    would log "Task exception was never retrieved" when it is collected.
+    """
+    if not task.cancelled():
+        task.exception()
+
+
+async def verify_api_key(
+    request: Request, settings: Settings = Depends(get_settings)
+) -> SessionConfig:
+    """Validate X-API-Key via remote service and return SessionConfig.
+
+    Successful results are cached for ``auth_cache_ttl_s`` seconds so repeated
+    requests with the same key skip the remote round trip; failures are never
+    cached. Concurrent requests with the same key await a single verification.
+    """
+    token = request.headers.get(settings.api_key_header, "").strip()
+    if not token:
+        logger.warning("Missing API key header")
+        raise AuthFailure("Missing X-API-Key")
+
+    cache_key = hashlib.sha256(token.encode()).hexdigest()
+    if settings.auth_cache_ttl_s > 0:
+        cfg = _auth_cache_get(cache_key)
+        if cfg is not None:
+            logger.debug("auth cache hit")
+            return cfg
+
+    task = _auth_inflight.get(cache_key)
+    if task is None:
+        task = asyncio.create_task(
+            _verify_and_cache(request.app.state.http, settings, token, cache_key)
+        )
+        task.add_done_callback(_retrieve_task_exception)
+        _auth_inflight[cache_key] = task
+    else:
+        logger.debug("joining in-flight auth verification")
+    # shield: one caller disconnecting must not cancel the shared verification
+    return await asyncio.shield(task)
+
+
 @dataclass
 class Components:
     """Per-request initialized components."""
@@ -297,8 +391,9 @@ class Components:
 
 
 async def get_components(cfg: SessionConfig = Depends(verify_api_key)) -> Components:
-    """Initialize ANP components; designed for quick construction per request."""
-    # NOTE: ANPCrawler likely holds caches internally; enable its cache to avoid re-fetching
+    """Initialize ANP components; a fresh crawler is built for every request."""
+    # ANPCrawler keeps per-session state (visited URLs, parsed interfaces, the
+    # agent description URI), so it must not be shared across requests.
     crawler = ANPCrawler(
         did_document_path=cfg.did_document_path,
         private_key_path=cfg.private_key_path,
@@ -405,6 +500,7 @@ async def anp_invoke_openrpc(
 def main(host: str, port: int, log_level: str) -> None:
     """CLI entry to launch the server with configured logging."""
     _settings_override.update(host=host, port=port, log_level=log_level)
+    get_settings.cache_clear()
     settings = get_settings()
     setup_logging(settings.log_level)
     logger.info("starting server", host=settings.host, port=settings.port)
@@ -1,5 +1,6 @@
 """远程 MCP 服务器实现（独立 fastmcp + Streamable HTTP）。"""
 
+import asyncio
 import json
 from collections.abc import Callable
 from dataclasses import dataclass
@@ -30,6 +31,19 @@ AUTH_VERIFY_PATH = "/api/v1/mcp-sk-api-keys/verify"
 # 每个会话独立的状态存储，键为 ServerSession（弱引用，随会话回收）
 SESSION_STORE: WeakKeyDictionary[Any, dict[str, Any]] = WeakKeyDictionary()
 
+# 鉴权失败时返回的固定结果，内容不变，模块加载时序列化一次
+AUTH_FAILED_RESPONSE = json.dumps(
+    {
+        "ok": False,
+        "error": {
+            "code": "AUTHENTICATION_FAILED",
+            "message": "Authentication failed. Please provide valid credentials.",
+        },
+    },
+    indent=2,
+    ensure_ascii=False,
+)
+
 
 @dataclass(frozen=True, slots=True)
 class SessionConfig:
@@ -63,6 +77,9 @@ def create_did_auth_callback(
     verify_url: str, api_key_header: str = "X-API-Key"
 ) -> AuthCallback:
     """创建一个通过远程 API 验证 token 并返回 DID 配置的回调函数。"""
+    # 回调在进程生命周期内反复调用，共享一个客户端以复用到认证服务的 keep-alive 连接
+    # （httpx.Client 线程安全，可在 to_thread 的工作线程中并发使用）
+    client = httpx.Client(timeout=15)
 
     def did_auth_callback(token: str) -> SessionConfig | None:
         if not token:
@@ -77,7 +94,7 @@ def create_did_auth_callback(
         )
 
         try:
-            response = httpx.get(verify_url, headers=headers, timeout=15)
+            response = client.get(verify_url, headers=headers)
             response.raise_for_status()
 
             try:
@@ -189,6 +206,7 @@ def ensure_session_initialized(ctx: Context) -> dict[str, Any] | None:
             did_doc=config.did_document_path,
             private_key=config.private_key_path,
         )
+        # 每个会话持有独立的 ANPCrawler，抓取缓存不在会话之间共享
         anp_crawler = ANPCrawler(
             did_document_path=config.did_document_path,
             private_key_path=config.private_key_path,
@@ -208,6 +226,26 @@ def ensure_session_initialized(ctx: Context) -> dict[str, Any] | None:
         return None
 
 
+async def ensure_session_initialized_async(ctx: Context) -> dict[str, Any] | None:
+    """异步版本的 ensure_session_initialized。
+
+    已初始化的会话直接返回；首次鉴权包含阻塞的 HTTP 调用与凭证文件读取，
+    放到工作线程中执行，避免阻塞事件循环上的其他会话。
+    同一会话的并发调用通过会话级锁串行化，保证只初始化一次。
+    """
+    state = _get_state(ctx)
+    if state.get("initialized"):
+        return state
+
+    lock = state.setdefault("init_lock", asyncio.Lock())
+    async with lock:
+        # 等待锁期间其他调用可能已完成初始化
+        if state.get("initialized"):
+            return state
+        # to_thread 会复制 contextvars，线程内仍可读取当前请求头
+        return await asyncio.to_thread(ensure_session_initialized, ctx)
+
+
 mcp_instructions = """这是一个 ANP 网络的 MCP 服务器，通过这个服务器，你就能够访问 ANP 网络的资源和接口。
 ANP网络提供一下的能力：
 - 酒店、景点的查询预订
@@ -248,19 +286,9 @@ async def anp_fetchDoc(ctx: Context, url: str) -> str:
     logger.info("Tool called", tool_name="anp.fetchDoc", params=params)
 
     try:
-        state = ensure_session_initialized(ctx)
+        state = await ensure_session_initialized_async(ctx)
         if state is None:
-            return json.dumps(
-                {
-                    "ok": False,
-                    "error": {
-                        "code": "AUTHENTICATION_FAILED",
-                        "message": "Authentication failed. Please provide valid credentials.",
-                    },
-                },
-                indent=2,
-                ensure_ascii=False,
-            )
+            return AUTH_FAILED_RESPONSE
 
         anp_handler: ANPHandler = state["anp_handler"]
         result = await anp_handler.handle_fetch_doc(params)
@@ -305,19 +333,9 @@ async def anp_invokeOpenRPC(
     logger.info("Tool called", tool_name="anp.invokeOpenRPC", args=arguments)
 
     try:
-        state = ensure_session_initialized(ctx)
+        state = await ensure_session_initialized_async(ctx)
         if state is None:
-            return json.dumps(
-                {
-                    "ok": False,
-                    "error": {
-                        "code": "AUTHENTICATION_FAILED",
-                        "message": "Authentication failed. Please provide valid credentials.",
-                    },
-                },
-                indent=2,
-                ensure_ascii=False,
-            )
+            return AUTH_FAILED_RESPONSE
 
         anp_handler: ANPHandler = state["anp_handler"]
         result = await anp_handler.handle_invoke_openrpc(arguments)
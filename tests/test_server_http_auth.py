@@ -0,0 +1,152 @@
+"""server_http 远程 API Key 鉴权缓存的单元测试。
+
+使用 respx 拦截鉴权服务请求，直接调用 verify_api_key 依赖。
+"""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+import pytest_asyncio
+import respx
+from starlette.requests import Request
+
+from mcp2anp import server_http
+from mcp2anp.server_http import AuthFailure, SessionConfig, Settings, verify_api_key
+
+pytestmark = pytest.mark.unit
+
+API_KEY = "sk-test-key"
+AUTH_PAYLOAD = {
+    "did": "did:wba:example.com:user:test",
+    "did_doc_path": "/tmp/did.json",
+    "private_pem_path": "/tmp/key.pem",
+}
+EXPECTED_CONFIG = SessionConfig(
+    did_document_path="/tmp/did.json", private_key_path="/tmp/key.pem"
+)
+
+
+def make_settings(ttl: float = 60.0) -> Settings:
+    return Settings(auth_cache_ttl_s=ttl)
+
+
+@pytest.fixture(autouse=True)
+def _clear_auth_state():
+    """每个用例使用干净的鉴权缓存与进行中任务表。"""
+    server_http._auth_cache.clear()
+    server_http._auth_inflight.clear()
+    yield
+    server_http._auth_cache.clear()
+    server_http._auth_inflight.clear()
+
+
+@pytest_asyncio.fixture
+async def http_client():
+    async with httpx.AsyncClient() as client:
+        yield client
+
+
+@pytest.fixture
+def auth_route():
+    """拦截鉴权服务的 verify 接口，默认返回鉴权成功。"""
+    settings = make_settings()
+    with respx.mock(base_url=settings.auth_base_url) as router:
+        route = router.get(settings.auth_verify_path)
+        route.return_value = httpx.Response(200, json=AUTH_PAYLOAD)
+        yield route
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """替换 server_http 使用的单调时钟，便于控制缓存过期。"""
+    now = [1000.0]
+    monkeypatch.setattr(server_http, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def make_request(client: httpx.AsyncClient, token: str = API_KEY) -> Request:
+    app = SimpleNamespace(state=SimpleNamespace(http=client))
+    scope = {
+        "type": "http",
+        "headers": [(b"x-api-key", token.encode())],
+        "app": app,
+    }
+    return Request(scope)
+
+
+async def test_cache_hit_skips_remote_call(http_client, auth_route):
+    settings = make_settings()
+
+    first = await verify_api_key(make_request(http_client), settings)
+    second = await verify_api_key(make_request(http_client), settings)
+
+    assert first == second == EXPECTED_CONFIG
+    assert auth_route.call_count == 1
+
+
+async def test_cache_entry_expires_after_ttl(http_client, auth_route, clock):
+    settings = make_settings(ttl=60.0)
+
+    await verify_api_key(make_request(http_client), settings)
+    clock[0] += 59.0
+    await verify_api_key(make_request(http_client), settings)
+    assert auth_route.call_count == 1
+
+    clock[0] += 1.0
+    cfg = await verify_api_key(make_request(http_client), settings)
+    assert cfg == EXPECTED_CONFIG
+    assert auth_route.call_count == 2
+
+
+async def test_unauthorized_response_is_not_cached(http_client, auth_route):
+    settings = make_settings()
+    auth_route.return_value = httpx.Response(401, json={"detail": "invalid"})
+
+    for _ in range(2):
+        with pytest.raises(AuthFailure) as exc_info:
+            await verify_api_key(make_request(http_client), settings)
+        assert exc_info.value.status_code == 401
+
+    assert auth_route.call_count == 2
+    assert not server_http._auth_cache
+
+
+async def test_zero_ttl_disables_cache(http_client, auth_route):
+    settings = make_settings(ttl=0)
+
+    for _ in range(3):
+        cfg = await verify_api_key(make_request(http_client), settings)
+        assert cfg == EXPECTED_CONFIG
+
+    assert auth_route.call_count == 3
+    assert not server_http._auth_cache
+
+
+async def test_concurrent_requests_share_one_verification(http_client, auth_route):
+    settings = make_settings()
+
+    results = await asyncio.gather(
+        *(verify_api_key(make_request(http_client), settings) for _ in range(5))
+    )
+
+    assert results == [EXPECTED_CONFIG] * 5
+    assert auth_route.call_count == 1
+    assert not server_http._auth_inflight
+
+
+async def test_concurrent_requests_share_one_failure(http_client, auth_route):
+    settings = make_settings()
+    auth_route.return_value = httpx.Response(401, json={"detail": "invalid"})
+
+    results = await asyncio.gather(
+        *(verify_api_key(make_request(http_client), settings) for _ in range(5)),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(r, AuthFailure) for r in results)
+    assert auth_route.call_count == 1
+    assert not server_http._auth_inflight
@@ -0,0 +1,58 @@
+"""server_http 请求级组件的单元测试。
+
+验证每个请求拿到独立的 ANPCrawler，爬虫状态不会在请求之间残留。
+"""
+
+from __future__ import annotations
+
+import pytest
+from anp.anp_crawler.anp_client import ANPClient
+
+from mcp2anp.core.handlers import (
+    DEFAULT_DID_DOCUMENT_PATH,
+    DEFAULT_DID_PRIVATE_KEY_PATH,
+)
+from mcp2anp.server_http import SessionConfig, get_components
+
+pytestmark = pytest.mark.unit
+
+SESSION_CONFIG = SessionConfig(
+    did_document_path=str(DEFAULT_DID_DOCUMENT_PATH),
+    private_key_path=str(DEFAULT_DID_PRIVATE_KEY_PATH),
+)
+
+
+@pytest.fixture(autouse=True)
+def _stub_fetch_url(monkeypatch):
+    """替换 ANPClient.fetch_url，避免真实网络请求。"""
+
+    async def fake_fetch_url(self, url, **kwargs):
+        return {
+            "success": True,
+            "text": '{"name": "agent"}',
+            "content_type": "application/json",
+            "status_code": 200,
+            "url": url,
+        }
+
+    monkeypatch.setattr(ANPClient, "fetch_url", fake_fetch_url)
+
+
+async def test_crawler_state_does_not_survive_between_requests():
+    first = await get_components(SESSION_CONFIG)
+    result = await first.anp_handler.handle_fetch_doc(
+        {"url": "https://a.example.com/ad.json"}
+    )
+    assert result["ok"] is True
+
+    second = await get_components(SESSION_CONFIG)
+    crawler = second.anp_handler.anp_crawler
+    assert crawler is not first.anp_handler.anp_crawler
+    assert not crawler._visited_urls
+    assert not crawler._cache
+    assert not crawler._anp_interfaces
+    assert crawler._agent_description_uri is None
+
+    await second.anp_handler.handle_fetch_doc({"url": "https://b.example.com/ad.json"})
+    assert crawler._visited_urls == {"https://b.example.com/ad.json"}
+    assert crawler._agent_description_uri == "https://b.example.com/ad.json"
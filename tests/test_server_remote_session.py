@@ -0,0 +1,77 @@
+"""server_remote 会话初始化的单元测试。"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from mcp2anp import server_remote
+from mcp2anp.server_remote import SessionConfig, ensure_session_initialized_async
+
+pytestmark = pytest.mark.unit
+
+SESSION_CONFIG = SessionConfig(
+    did_document_path="/tmp/did.json", private_key_path="/tmp/key.pem"
+)
+
+
+class FakeSession:
+    """可被 SESSION_STORE 弱引用的会话占位对象。"""
+
+
+class FakeCrawler:
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+
+@pytest.fixture
+def auth_calls(monkeypatch):
+    """替换请求头、鉴权回调与 ANPCrawler，返回鉴权回调的调用次数记录。"""
+    calls = []
+    calls_lock = threading.Lock()
+
+    def slow_callback(token: str) -> SessionConfig:
+        with calls_lock:
+            calls.append(token)
+        # 放大并发窗口：第一次鉴权完成前其余调用都已到达
+        time.sleep(0.05)
+        return SESSION_CONFIG
+
+    monkeypatch.setattr(
+        server_remote, "get_http_headers", lambda: {"X-API-Key": "sk-test"}
+    )
+    monkeypatch.setattr(server_remote, "_auth_callback", slow_callback)
+    monkeypatch.setattr(server_remote, "ANPCrawler", FakeCrawler)
+    return calls
+
+
+async def test_concurrent_first_calls_initialize_session_once(auth_calls):
+    ctx = SimpleNamespace(session=FakeSession())
+
+    states = await asyncio.gather(
+        *(ensure_session_initialized_async(ctx) for _ in range(5))
+    )
+
+    assert auth_calls == ["sk-test"]
+    first = states[0]
+    assert all(state is first for state in states)
+    assert first["initialized"] is True
+    assert first["config"] == SESSION_CONFIG
+    assert isinstance(first["anp_crawler"], FakeCrawler)
+
+
+async def test_sessions_are_initialized_independently(auth_calls):
+    first = await ensure_session_initialized_async(
+        SimpleNamespace(session=FakeSession())
+    )
+    second = await ensure_session_initialized_async(
+        SimpleNamespace(session=FakeSession())
+    )
+
+    assert len(auth_calls) == 2
+    assert first is not second
+    assert first["anp_crawler"] is not second["anp_crawler"]